@@ -1,14 +1,29 @@
+import csv
 import sqlite3
+import sys
 from datetime import datetime, timedelta
-import pandas as pd
-import matplotlib.pyplot as plt
 import getpass
 import hashlib
+import hmac
+import itertools
 import json
+import os
+
+def pearson(a, b):
+    """Pearson correlation of two float arrays, NaN if either is constant."""
+    a = a - a.mean()
+    b = b - b.mean()
+    denominator = (a @ a) * (b @ b)
+    if denominator == 0:
+        return float('nan')
+    return float((a @ b) / denominator ** 0.5)
 
 class LifeTracker:
     def __init__(self, db_name="life_tracker.db"):
-        self.conn = sqlite3.connect(db_name)
+        # Statement cache is keyed on SQL text, so the fixed query strings
+        # below are only prepared once per connection
+        self.conn = sqlite3.connect(db_name, cached_statements=256)
+        self.cursor = self.conn.cursor()
         self.setup_database()
         self.current_user = None
         self.default_metrics = {
@@ -81,20 +96,33 @@ class LifeTracker:
 
     def setup_database(self):
         """Create the necessary tables if they don't exist."""
-        cursor = self.conn.cursor()
+        # WAL with synchronous=NORMAL avoids a full fsync on every commit
+        self.conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -8000;
+            PRAGMA foreign_keys = ON;
+        """)
 
         # Create users table
-        cursor.execute("""
+        self.cursor.execute("""
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY,
             username TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
+            password_hash BLOB NOT NULL,
+            salt BLOB,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP
         )
         """)
 
+        # Add salt column to databases created before per-user salts
+        self.cursor.execute("PRAGMA table_info(users)")
+        if 'salt' not in [column[1] for column in self.cursor.fetchall()]:
+            self.cursor.execute("ALTER TABLE users ADD COLUMN salt BLOB")
+
         # Create categories table with user_id
-        cursor.execute("""
+        self.cursor.execute("""
         CREATE TABLE IF NOT EXISTS categories (
             id INTEGER PRIMARY KEY,
             user_id INTEGER,
@@ -105,7 +133,7 @@ class LifeTracker:
         """)
 
         # Create metrics table with description fields
-        cursor.execute("""
+        self.cursor.execute("""
         CREATE TABLE IF NOT EXISTS metrics (
             id INTEGER PRIMARY KEY,
             user_id INTEGER,
@@ -124,24 +152,91 @@ class LifeTracker:
         )
         """)
 
-        # Create entries table
-        cursor.execute("""
+        # Create entries table; deleting a metric deletes its entries
+        entries_schema = """
         CREATE TABLE IF NOT EXISTS entries (
             id INTEGER PRIMARY KEY,
             user_id INTEGER,
             metric_id INTEGER,
             value REAL,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            timestamp INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+            day TEXT,
             FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (metric_id) REFERENCES metrics (id)
+            FOREIGN KEY (metric_id) REFERENCES metrics (id) ON DELETE CASCADE
+        )
+        """
+        self.cursor.execute(entries_schema)
+
+        # Add and backfill the day column for databases created before it
+        self.cursor.execute("PRAGMA table_info(entries)")
+        if 'day' not in [column[1] for column in self.cursor.fetchall()]:
+            self.cursor.execute("ALTER TABLE entries ADD COLUMN day TEXT")
+            self.cursor.execute("UPDATE entries SET day = date(timestamp)")
+
+        # Convert ISO text timestamps (stored in local time) to Unix seconds
+        self.cursor.execute("SELECT 1 FROM entries WHERE typeof(timestamp) = 'text' LIMIT 1")
+        if self.cursor.fetchone() is not None:
+            self.cursor.execute("""
+            UPDATE entries
+            SET timestamp = CAST(strftime('%s', timestamp, 'utc') AS INTEGER)
+            WHERE typeof(timestamp) = 'text'
+            """)
+
+        # Foreign keys can't be altered, so rebuild entries on databases
+        # created before ON DELETE CASCADE (dropping rows of deleted metrics)
+        self.cursor.execute("PRAGMA foreign_key_list(entries)")
+        if not any(fk[3] == 'metric_id' and fk[6] == 'CASCADE'
+                   for fk in self.cursor.fetchall()):
+            self.conn.executescript(f"""
+                BEGIN;
+                ALTER TABLE entries RENAME TO entries_old;
+                {entries_schema};
+                INSERT INTO entries (id, user_id, metric_id, value, timestamp, day)
+                SELECT id, user_id, metric_id, value, timestamp, day
+                FROM entries_old
+                WHERE metric_id IN (SELECT id FROM metrics);
+                DROP TABLE entries_old;
+                COMMIT;
+            """)
+
+        # Metric and category lookups by (user_id, name) are already covered
+        # by their UNIQUE constraints. A metric belongs to a single user, so
+        # (metric_id, day) serves both the range queries and the cascade.
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_entries_metric_day'"
         )
+        index_missing = self.cursor.fetchone() is None
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_entries_metric_day
+        ON entries (metric_id, day)
         """)
 
         self.conn.commit()
 
-    def hash_password(self, password):
+        # Gather planner statistics once, when the index is first created
+        if index_missing:
+            self.conn.executescript("""
+                PRAGMA analysis_limit = 400;
+                ANALYZE;
+            """)
+
+    def hash_password(self, password, salt):
         """Hash a password for storing."""
-        return hashlib.sha256(password.encode('utf-8')).hexdigest()
+        return hashlib.scrypt(
+            password.encode('utf-8'), salt=salt, n=16384, r=8, p=1, dklen=32
+        )
+
+    def verify_password(self, password, salt, password_hash):
+        """Check a password against a stored hash in constant time."""
+        if salt is None:
+            # Accounts created before salting used a plain SHA-256 hash
+            candidate = hashlib.sha256(password.encode('utf-8')).digest()
+        else:
+            candidate = self.hash_password(password, salt)
+        if isinstance(password_hash, str):
+            # Hashes stored before the switch to BLOB are hex text
+            password_hash = bytes.fromhex(password_hash)
+        return hmac.compare_digest(candidate, password_hash)
 
     def register_user(self):
         """Register a new user."""
@@ -153,9 +248,8 @@ class LifeTracker:
                 print("❌ Username cannot be empty!")
                 continue
 
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
-            if cursor.fetchone() is not None:
+            self.cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
+            if self.cursor.fetchone() is not None:
                 print("❌ Username already taken!")
                 continue
 
@@ -171,13 +265,14 @@ class LifeTracker:
 
             break
 
-        cursor.execute(
-            "INSERT INTO users (username, password_hash) VALUES (?, ?)",
-            (username, self.hash_password(password))
+        salt = os.urandom(16)
+        self.cursor.execute(
+            "INSERT INTO users (username, password_hash, salt) VALUES (?, ?, ?)",
+            (username, self.hash_password(password, salt), salt)
         )
         self.conn.commit()
         self.current_user = {
-            'id': cursor.lastrowid,
+            'id': self.cursor.lastrowid,
             'username': username
         }
 
@@ -190,14 +285,25 @@ class LifeTracker:
             username = input("Username: ").strip()
             password = getpass.getpass("Password: ")
 
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "SELECT id, password_hash FROM users WHERE username = ?",
+            self.cursor.execute(
+                "SELECT id, password_hash, salt FROM users WHERE username = ?",
                 (username,)
             )
-            result = cursor.fetchone()
+            result = self.cursor.fetchone()
+
+            if result is None:
+                # Hash anyway so unknown usernames take as long to reject
+                self.hash_password(password, os.urandom(16))
+            elif self.verify_password(password, result[2], result[1]):
+                if result[2] is None or isinstance(result[1], str):
+                    # Upgrade legacy hash now that we know the password
+                    salt = os.urandom(16)
+                    with self.conn:
+                        self.cursor.execute(
+                            "UPDATE users SET password_hash = ?, salt = ? WHERE id = ?",
+                            (self.hash_password(password, salt), salt, result[0])
+                        )
 
-            if result and result[1] == self.hash_password(password):
                 self.current_user = {
                     'id': result[0],
                     'username': username
@@ -225,34 +331,55 @@ class LifeTracker:
 
     def setup_default_metrics(self):
         """Set up the default set of metrics for a user."""
-        cursor = self.conn.cursor()
+        self.save_metrics(self.default_metrics)
+        print("\n✅ Default metrics set up successfully!")
+
+    def save_metrics(self, categories):
+        """Insert categories and their metrics for the current user in one transaction."""
+        user_id = self.current_user['id']
+
+        with self.conn:
+            # Create categories
+            self.insert_rows(
+                "INSERT INTO categories (user_id, name)",
+                [(user_id, category_name) for category_name in categories]
+            )
 
-        for category_name, metrics in self.default_metrics.items():
-            # Create category
-            cursor.execute(
-                "INSERT INTO categories (user_id, name) VALUES (?, ?)",
-                (self.current_user['id'], category_name)
+            self.cursor.execute(
+                "SELECT id, name FROM categories WHERE user_id = ?",
+                (user_id,)
             )
-            category_id = cursor.lastrowid
+            category_ids = {name: category_id for category_id, name in self.cursor.fetchall()}
 
             # Create metrics
-            for metric in metrics:
-                cursor.execute("""
-                    INSERT INTO metrics (
-                        user_id, category_id, name, type, min_value, max_value,
-                        description, example, example_low, example_high
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    self.current_user['id'], category_id, metric['name'],
+            metric_rows = [
+                (
+                    user_id, category_ids[category_name], metric['name'],
                     metric['type'], metric['min_value'], metric['max_value'],
                     metric['description'],
                     metric.get('example'),
                     metric.get('example_low'),
                     metric.get('example_high')
-                ))
-
-        self.conn.commit()
-        print("\n✅ Default metrics set up successfully!")
+                )
+                for category_name, metrics in categories.items()
+                for metric in metrics
+            ]
+            self.insert_rows("""
+                INSERT INTO metrics (
+                    user_id, category_id, name, type, min_value, max_value,
+                    description, example, example_low, example_high
+                )""", metric_rows)
+
+    def insert_rows(self, insert_sql, rows, batch_size=50):
+        """Insert rows using multi-row VALUES statements of up to batch_size rows."""
+        # 50 rows of up to 10 columns stays under SQLite's 999 parameter limit
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            placeholders = "(" + ", ".join(["?"] * len(batch[0])) + ")"
+            self.cursor.execute(
+                insert_sql + " VALUES " + ", ".join([placeholders] * len(batch)),
+                list(itertools.chain.from_iterable(batch))
+            )
 
     def create_custom_metrics(self):
         """Guide user through creating custom metrics."""
@@ -302,31 +429,7 @@ class LifeTracker:
                 categories[category_name].append(metric)
 
         # Save custom metrics to database
-        cursor = self.conn.cursor()
-
-        for category_name, metrics in categories.items():
-            cursor.execute(
-                "INSERT INTO categories (user_id, name) VALUES (?, ?)",
-                (self.current_user['id'], category_name)
-            )
-            category_id = cursor.lastrowid
-
-            for metric in metrics:
-                cursor.execute("""
-                    INSERT INTO metrics (
-                        user_id, category_id, name, type, min_value, max_value,
-                        description, example, example_low, example_high
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    self.current_user['id'], category_id, metric['name'],
-                    metric['type'], metric['min_value'], metric['max_value'],
-                    metric['description'],
-                    metric.get('example'),
-                    metric.get('example_low'),
-                    metric.get('example_high')
-                ))
-
-        self.conn.commit()
+        self.save_metrics(categories)
         print("\n✅ Custom metrics set up successfully!")
 
     def manage_metrics(self):
@@ -354,45 +457,65 @@ class LifeTracker:
             else:
                 print("❌ Invalid choice!")
 
-    def view_metrics(self):
-        """View all current metrics."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT c.name, m.name, m.type, m.min_value, m.max_value, m.description
+    def fetch_metrics(self):
+        """Fetch all metrics for the current user, ordered by category and name."""
+        self.cursor.execute("""
+            SELECT m.id, c.name, m.name, m.type, m.min_value, m.max_value,
+                   m.description, m.example, m.example_low, m.example_high
             FROM metrics m
             JOIN categories c ON m.category_id = c.id
             WHERE m.user_id = ?
             ORDER BY c.name, m.name
         """, (self.current_user['id'],))
 
-        results = cursor.fetchall()
+        return self.cursor.fetchall()
+
+    def find_metric(self, metrics, metric_name):
+        """Return the row named metric_name from fetch_metrics() rows, or None."""
+        for row in metrics:
+            _, _, name, *_ = row
+            if name == metric_name:
+                return row
+        return None
+
+    def view_metrics(self, results=None):
+        """View all current metrics."""
+        if results is None:
+            results = self.fetch_metrics()
+
         current_category = None
 
-        print("\n" + "="*50)
-        print("📊 YOUR CURRENT METRICS 📊".center(50))
-        print("="*50 + "\n")
+        # Build the listing first and write it in one go
+        lines = [
+            "\n" + "="*50,
+            "📊 YOUR CURRENT METRICS 📊".center(50),
+            "="*50 + "\n"
+        ]
 
         for row in results:
-            category, name, type_, min_val, max_val, desc = row
+            _, category, name, type_, min_val, max_val, desc, *_ = row
             if current_category != category:
                 current_category = category
-                print(f"\n{category.upper()}")
-                print("-"*25)
-            print(f"• {name} ({type_})")
-            print(f"  └─ {desc}")
-            print(f"  └─ Range: {min_val} to {max_val if max_val is not None else 'unlimited'}")
+                lines.append(f"\n{category.upper()}")
+                lines.append("-"*25)
+            lines.append(f"• {name} ({type_})")
+            lines.append(f"  └─ {desc}")
+            lines.append(f"  └─ Range: {min_val} to {max_val if max_val is not None else 'unlimited'}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def add_new_metric(self):
         """Add a new metric."""
         print("\n➕ Add New Metric")
 
+        user_id = self.current_user['id']
+
         # Show existing categories and option to create new
-        cursor = self.conn.cursor()
-        cursor.execute(
+        self.cursor.execute(
             "SELECT id, name FROM categories WHERE user_id = ?",
-            (self.current_user['id'],)
+            (user_id,)
         )
-        categories = cursor.fetchall()
+        categories = self.cursor.fetchall()
 
         print("\nExisting categories:")
         for i, (_, name) in enumerate(categories, 1):
@@ -408,11 +531,11 @@ class LifeTracker:
                     break
                 elif choice == len(categories) + 1:
                     category_name = input("Enter new category name: ").strip()
-                    cursor.execute(
+                    self.cursor.execute(
                         "INSERT INTO categories (user_id, name) VALUES (?, ?)",
-                        (self.current_user['id'], category_name)
+                        (user_id, category_name)
                     )
-                    category_id = cursor.lastrowid
+                    category_id = self.cursor.lastrowid
                     break
             except ValueError:
                 print("❌ Please enter a number!")
@@ -445,13 +568,13 @@ class LifeTracker:
             metric['example_high'] = None
 
         # Save to database
-        cursor.execute("""
+        self.cursor.execute("""
             INSERT INTO metrics (
                 user_id, category_id, name, type, min_value, max_value,
                 description, example, example_low, example_high
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
-            self.current_user['id'], category_id, metric['name'],
+            user_id, category_id, metric['name'],
             metric['type'], metric['min_value'], metric['max_value'],
             metric['description'], metric['example'],
             metric['example_low'], metric['example_high']
@@ -462,42 +585,35 @@ class LifeTracker:
 
     def edit_metric(self):
         """Edit an existing metric."""
-        self.view_metrics()
+        metrics = self.fetch_metrics()
+        self.view_metrics(metrics)
 
-        cursor = self.conn.cursor()
         metric_name = input("\nEnter the name of the metric to edit: ").strip()
 
-        cursor.execute("""
-            SELECT id, type, min_value, max_value, description,
-                   example, example_low, example_high
-            FROM metrics
-            WHERE user_id = ? AND name = ?
-        """, (self.current_user['id'], metric_name))
-
-        metric = cursor.fetchone()
+        metric = self.find_metric(metrics, metric_name)
         if not metric:
             print("❌ Metric not found!")
             return
 
-        metric_id = metric[0]
+        metric_id, _, _, type_, min_val, max_val, desc, ex, ex_low, ex_high = metric
         print("\nLeave blank to keep current value")
 
         # Get new values
-        new_min = input(f"New minimum value [{metric[2]}]: ").strip()
-        new_max = input(f"New maximum value [{metric[3]}]: ").strip()
-        new_desc = input(f"New description [{metric[4]}]: ").strip()
+        new_min = input(f"New minimum value [{min_val}]: ").strip()
+        new_max = input(f"New maximum value [{max_val}]: ").strip()
+        new_desc = input(f"New description [{desc}]: ").strip()
 
-        if metric[1] == 'qualitative':
-            new_ex_low = input(f"New example for lowest value [{metric[6]}]: ").strip()
-            new_ex_high = input(f"New example for highest value [{metric[7]}]: ").strip()
+        if type_ == 'qualitative':
+            new_ex_low = input(f"New example for lowest value [{ex_low}]: ").strip()
+            new_ex_high = input(f"New example for highest value [{ex_high}]: ").strip()
             new_ex = None
         else:
-            new_ex = input(f"New example [{metric[5]}]: ").strip()
+            new_ex = input(f"New example [{ex}]: ").strip()
             new_ex_low = None
             new_ex_high = None
 
         # Update database with new values, keeping old values where blank
-        cursor.execute("""
+        self.cursor.execute("""
             UPDATE metrics
             SET min_value = ?,
                 max_value = ?,
@@ -507,12 +623,12 @@ class LifeTracker:
                 example_high = ?
             WHERE id = ?
         """, (
-            float(new_min) if new_min else metric[2],
-            float(new_max) if new_max else metric[3],
-            new_desc if new_desc else metric[4],
-            new_ex if new_ex else metric[5],
-            new_ex_low if new_ex_low else metric[6],
-            new_ex_high if new_ex_high else metric[7],
+            float(new_min) if new_min else min_val,
+            float(new_max) if new_max else max_val,
+            new_desc if new_desc else desc,
+            new_ex if new_ex else ex,
+            new_ex_low if new_ex_low else ex_low,
+            new_ex_high if new_ex_high else ex_high,
             metric_id
         ))
 
@@ -521,30 +637,25 @@ class LifeTracker:
 
     def delete_metric(self):
         """Delete an existing metric."""
-        self.view_metrics()
+        metrics = self.fetch_metrics()
+        self.view_metrics(metrics)
 
         metric_name = input("\nEnter the name of the metric to delete: ").strip()
 
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT id FROM metrics
-            WHERE user_id = ? AND name = ?
-        """, (self.current_user['id'], metric_name))
-
-        metric = cursor.fetchone()
+        metric = self.find_metric(metrics, metric_name)
         if not metric:
             print("❌ Metric not found!")
             return
 
+        metric_id = metric[0]
         confirm = input(f"\n⚠️ Are you sure you want to delete '{metric_name}'? This will delete all associated data! (y/n): ")
         if confirm.lower() != 'y':
             print("Deletion cancelled.")
             return
 
-        # Delete metric and its entries
-        cursor.execute("DELETE FROM entries WHERE metric_id = ?", (metric[0],))
-        cursor.execute("DELETE FROM metrics WHERE id = ?", (metric[0],))
-        self.conn.commit()
+        # Delete metric; its entries go with it via ON DELETE CASCADE
+        with self.conn:
+            self.cursor.execute("DELETE FROM metrics WHERE id = ?", (metric_id,))
 
         print("\n✅ Metric and associated data deleted successfully!")
 
@@ -554,7 +665,7 @@ class LifeTracker:
             print("❌ Please log in first!")
             return
 
-        cursor = self.conn.cursor()
+        user_id = self.current_user['id']
 
         if entry_date is None:
             entry_date = datetime.now()
@@ -562,38 +673,44 @@ class LifeTracker:
         else:
             date_str = entry_date.strftime("%Y-%m-%d")
 
-        cursor.execute("""
-            SELECT m.name, m.type, m.min_value, m.max_value, c.name,
+        self.cursor.execute("""
+            SELECT m.id, m.name, m.type, m.min_value, m.max_value, c.name,
                    m.description, m.example, m.example_low, m.example_high
             FROM metrics m
             JOIN categories c ON m.category_id = c.id
             WHERE m.user_id = ?
             ORDER BY c.name, m.name
-        """, (self.current_user['id'],))
+        """, (user_id,))
 
-        metrics = cursor.fetchall()
+        metrics = self.cursor.fetchall()
 
         print("\n" + "="*50)
         print(f"🌟 DAILY TRACKING - {date_str.upper()} 🌟".center(50))
         print("="*50 + "\n")
 
+        timestamp = int(entry_date.timestamp())
+        day = entry_date.strftime("%Y-%m-%d")
+        rows = []
         current_category = None
         for metric in metrics:
-            name, type_, min_val, max_val, category, desc, ex, ex_low, ex_high = metric
+            metric_id, name, type_, min_val, max_val, category, desc, ex, ex_low, ex_high = metric
 
+            lines = []
             if current_category != category:
                 current_category = category
-                print(f"\n{category.upper()}")
-                print("-"*25)
+                lines.append(f"\n{category.upper()}")
+                lines.append("-"*25)
 
-            print(f"\n• {name}")
-            print(f"  └─ {desc}")
+            lines.append(f"\n• {name}")
+            lines.append(f"  └─ {desc}")
 
             if type_ == 'qualitative':
-                print(f"  └─ Low: {ex_low}")
-                print(f"  └─ High: {ex_high}")
+                lines.append(f"  └─ Low: {ex_low}")
+                lines.append(f"  └─ High: {ex_high}")
             elif ex:
-                print(f"  └─ Example: {ex}")
+                lines.append(f"  └─ Example: {ex}")
+
+            sys.stdout.write("\n".join(lines) + "\n")
 
             while True:
                 try:
@@ -604,103 +721,146 @@ class LifeTracker:
 
                     value = float(value)
 
-                    cursor.execute("""
-                        INSERT INTO entries (user_id, metric_id, value, timestamp)
-                        SELECT ?, m.id, ?, ?
-                        FROM metrics m
-                        WHERE m.user_id = ? AND m.name = ?
-                    """, (self.current_user['id'], value, entry_date,
-                         self.current_user['id'], name))
-
-                    self.conn.commit()
+                    rows.append((user_id, metric_id, value, timestamp, day))
                     print("✅ Recorded!")
                     break  # Break out of the inner while loop only
                 except ValueError as e:
                     print(f"❌ Oops! {e}. Let's try that again.")
 
+        # Save all responses in a single transaction
+        with self.conn:
+            self.cursor.executemany("""
+                INSERT INTO entries (user_id, metric_id, value, timestamp, day)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+
         print("\n✅ Daily tracking complete!")
 
+    def import_entries(self, csv_path):
+        """Bulk import entries from a CSV file with date, metric and value columns."""
+        if self.current_user is None:
+            print("❌ Please log in first!")
+            return
+
+        user_id = self.current_user['id']
+        metric_ids = {name: metric_id for metric_id, _, name, *_ in self.fetch_metrics()}
+        skipped = 0
+
+        def rows(reader):
+            nonlocal skipped
+            for record in reader:
+                try:
+                    # DictReader fills fields missing from short rows with None
+                    metric_id = metric_ids[(record['metric'] or '').strip()]
+                    entry_date = datetime.strptime((record['date'] or '').strip(), "%Y-%m-%d")
+                    value = float(record['value'])
+                except (KeyError, TypeError, ValueError):
+                    # KeyError here means an unknown metric name
+                    skipped += 1
+                    continue
+                yield (user_id, metric_id, value,
+                       int(entry_date.timestamp()), entry_date.strftime("%Y-%m-%d"))
+
+        # utf-8-sig drops the byte order mark Excel writes on "CSV UTF-8" exports
+        with open(csv_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            missing = {'date', 'metric', 'value'} - set(reader.fieldnames or [])
+            if missing:
+                print(f"❌ CSV header is missing column(s): {', '.join(sorted(missing))}")
+                return
+
+            # Stream rows through one prepared statement inside a single transaction
+            with self.conn:
+                self.cursor.executemany("""
+                    INSERT INTO entries (user_id, metric_id, value, timestamp, day)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows(reader))
+                imported = self.cursor.rowcount
+
+        print(f"\n✅ Imported {imported} entries!")
+        if skipped:
+            print(f"⚠️ Skipped {skipped} rows with an unknown metric or invalid date/value.")
+
     def get_correlation(self, metric1_name, metric2_name, days):
         """Calculate correlation between two metrics for the specified number of days."""
+        import numpy as np
+
         if self.current_user is None:
             print("❌ Please log in first!")
             return None
 
-        cursor = self.conn.cursor()
+        user_id = self.current_user['id']
 
+        # Single pass over entries: average each metric per day and keep
+        # only the days on which both were recorded
         query = """
-        WITH metric_data AS (
-            SELECT
-                m.name,
-                e.value,
-                date(e.timestamp) as date
-            FROM entries e
-            JOIN metrics m ON e.metric_id = m.id
-            WHERE
-                m.user_id = ?
-                AND m.name IN (?, ?)
-                AND e.timestamp >= date('now', ?)
-        )
         SELECT
-            m1.date,
-            m1.value as metric1_value,
-            m2.value as metric2_value
-        FROM
-            (SELECT * FROM metric_data WHERE name = ?) m1
-        JOIN
-            (SELECT * FROM metric_data WHERE name = ?) m2
-        ON m1.date = m2.date
-        ORDER BY m1.date
+            e.day as date,
+            AVG(CASE WHEN m.name = ? THEN e.value END) as metric1_value,
+            AVG(CASE WHEN m.name = ? THEN e.value END) as metric2_value
+        FROM entries e
+        JOIN metrics m ON e.metric_id = m.id
+        WHERE
+            m.user_id = ?
+            AND m.name IN (?, ?)
+            AND e.day >= ?
+        GROUP BY e.day
+        HAVING metric1_value IS NOT NULL AND metric2_value IS NOT NULL
+        ORDER BY e.day
         """
 
-        days_ago = f'-{days} days'
-        cursor.execute(query, (
-            self.current_user['id'], metric1_name, metric2_name,
-            days_ago, metric1_name, metric2_name
+        start_day = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        self.cursor.execute(query, (
+            metric1_name, metric2_name, user_id,
+            metric1_name, metric2_name, start_day
         ))
 
-        results = cursor.fetchall()
+        results = self.cursor.fetchall()
         if not results:
             return None
 
-        df = pd.DataFrame(results, columns=['date', 'metric1', 'metric2'])
-        correlation = df['metric1'].corr(df['metric2'])
-
-        return correlation
+        data = np.array(results, dtype=[('date', 'U10'), ('metric1', 'f8'), ('metric2', 'f8')])
+        return pearson(data['metric1'], data['metric2'])
 
     def visualize_metric(self, metric_name, days=7):
         """Visualize a single metric over the specified number of days."""
+        import matplotlib.pyplot as plt
+        import pandas as pd
+
         if self.current_user is None:
             print("❌ Please log in first!")
             return
 
-        cursor = self.conn.cursor()
+        user_id = self.current_user['id']
 
         query = """
         SELECT
-            date(e.timestamp) as date,
+            e.day as date,
             e.value
         FROM entries e
         JOIN metrics m ON e.metric_id = m.id
         WHERE
             m.user_id = ?
             AND m.name = ?
-            AND e.timestamp >= date('now', ?)
-        ORDER BY e.timestamp
+            AND e.day >= ?
+        ORDER BY e.day
         """
 
-        days_ago = f'-{days} days'
-        cursor.execute(query, (self.current_user['id'], metric_name, days_ago))
+        start_day = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        # Read in chunks so the full result never exists as Python tuples
+        df = pd.concat(pd.read_sql_query(
+            query, self.conn,
+            params=(user_id, metric_name, start_day),
+            parse_dates={'date': '%Y-%m-%d'},
+            chunksize=10000
+        ), ignore_index=True)
 
-        results = cursor.fetchall()
-        if not results:
+        if df.empty:
             print(f"No data available for {metric_name} in the past {days} days.")
             return
 
-        dates, values = zip(*results)
-
         plt.figure(figsize=(10, 6))
-        plt.plot(dates, values, 'bo-')
+        df.plot(x='date', y='value', style='bo-', legend=False, ax=plt.gca())
         plt.title(f'{metric_name} - Past {days} Days')
         plt.xticks(rotation=45)
         plt.grid(True)
@@ -747,10 +907,11 @@ def main():
         print("3. 📅 Enter data for a different date")
         print("4. 📈 Visualize metric over time")
         print("5. ⚙️  Manage metrics")
-        print("6. 👋 Logout")
+        print("6. 📥 Import data from CSV")
+        print("7. 👋 Logout")
         print("-"*25)
 
-        choice = input("\nWhat would you like to do? (1-6): ")
+        choice = input("\nWhat would you like to do? (1-7): ")
 
         if choice == "1":
             tracker.interactive_entry()
@@ -770,6 +931,12 @@ def main():
         elif choice == "5":
             tracker.manage_metrics()
         elif choice == "6":
+            csv_path = input("CSV file path (columns: date, metric, value): ").strip()
+            try:
+                tracker.import_entries(csv_path)
+            except (OSError, UnicodeDecodeError, csv.Error) as e:
+                print(f"❌ Could not read file: {e}")
+        elif choice == "7":
             tracker.current_user = None
             print("\n👋 Logged out successfully!")
         else: